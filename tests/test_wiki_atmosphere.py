@@ -1,9 +1,45 @@
 """
 Автотесты для проверки состава атмосферы планет на ru.wikipedia.org
 """
+import hashlib
+import os
 import re
+import time
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import unquote
+
+import httpx
 import pytest
-from playwright.sync_api import Page, expect
+from lxml import html as lxml_html
+from playwright.sync_api import Page, Route, expect
+
+WIKI_REST_HTML_URL = "https://ru.wikipedia.org/api/rest_v1/page/html/{slug}"
+# Wikimedia требует осмысленный User-Agent для запросов к API
+API_HEADERS = {"User-Agent": "ai_test-atmosphere-tests/1.0 (pytest)"}
+
+# Дисковый кэш ответов включается переменной окружения WIKI_TEST_USE_CACHE=1
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "wiki"
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Таблицы для parse_percent: удаляем все байты кроме цифр, запятых, точек и минусов,
+# запятую заменяем на точку
+_PCT_KEEP = b"0123456789,.-"
+_PCT_DELETE = bytes(b for b in range(256) if b not in _PCT_KEEP)
+_PCT_TABLE = bytes.maketrans(b",", b".")
+
+# Регулярные выражения для разбора ячеек таблиц компилируются один раз
+_HAS_DIGIT_RE = re.compile(r'\d')
+_NUM_RE = re.compile(r'\d+[,.]\d+')
+
+# Ячейка th/td со словом "кислород" в любом регистре (XPath 1.0 не умеет lower-case)
+_OXYGEN_CELL_XPATH = '[self::th or self::td][contains(translate(., "КИСЛОРД", "кислорд"), "кислород")]'
+# Узлы, которых нет в видимом тексте (innerText): скрытые ключи сортировки и сноски
+_INVISIBLE_XPATH = (
+    '//*[contains(translate(@style, " ", ""), "display:none")]'
+    ' | //*[contains(concat(" ", normalize-space(@class), " "), " sortkey ")]'
+    ' | //sup[contains(concat(" ", normalize-space(@class), " "), " reference ")]'
+)
 
 
 def parse_percent(text: str) -> float:
@@ -16,120 +52,248 @@ def parse_percent(text: str) -> float:
     Returns:
         float: Числовое значение процента
     """
-    # Удаляем все символы кроме цифр, запятых, точек и минусов
-    cleaned = re.sub(r'[^\d,.\-]', '', text)
-    # Заменяем запятую на точку
-    cleaned = cleaned.replace(',', '.')
+    # Отбрасываем не-ASCII символы (≈, пробелы и т.п.), затем за один проход
+    # удаляем все кроме цифр, запятых, точек и минусов и заменяем запятую на точку
+    cleaned = text.encode('ascii', 'ignore').translate(_PCT_TABLE, _PCT_DELETE)
     try:
         return float(cleaned)
     except ValueError:
         raise ValueError(f"Не удалось распарсить процент из текста: {text}")
 
 
-@pytest.fixture(scope="function")
-def page(browser):
-    """Создает новую страницу с настройками для видимого браузера."""
+def pick_percent_cell(cells: Iterable[str]) -> str | None:
+    """
+    Выбирает ячейку с процентным значением из текстов ячеек строки "Кислород".
+    
+    Args:
+        cells: Тексты ячеек строки таблицы
+    
+    Returns:
+        str | None: Текст ячейки с числом или None, если такой ячейки нет
+    """
+    for cell_text in cells:
+        cell_text = cell_text.strip()
+        # Пропускаем ячейку, если она содержит только "Кислород" без цифр
+        if 'кислород' in cell_text.lower() and not _HAS_DIGIT_RE.search(cell_text):
+            continue
+        # Ищем ячейку с процентом или числом
+        if '%' in cell_text or _NUM_RE.search(cell_text):
+            return cell_text
+    return None
+
+
+class ResponseCache:
+    """Дисковый кэш HTML-ответов по URL с ограниченным временем жизни."""
+    
+    def __init__(self, cache_dir: Path = CACHE_DIR, ttl: float = CACHE_TTL_SECONDS):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.md5(url.encode()).hexdigest()}.html"
+    
+    def get(self, url: str) -> str | None:
+        """Возвращает HTML из кэша или None, если записи нет или она устарела."""
+        path = self._path(url)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+    
+    def set(self, url: str, html: str) -> None:
+        """Сохраняет HTML в кэш."""
+        path = self._path(url)
+        # Пишем через временный файл, чтобы параллельные воркеры не читали недописанный HTML
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(html, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+def fetch_atmosphere_html(slug: str, cache: ResponseCache | None = None) -> str:
+    """
+    Загружает HTML статьи через MediaWiki REST API без запуска браузера.
+    
+    Args:
+        slug: Название статьи (например, "Атмосфера_Земли")
+        cache: Дисковый кэш ответов; None - всегда загружать из сети
+    
+    Returns:
+        str: HTML статьи
+    """
+    url = WIKI_REST_HTML_URL.format(slug=slug)
+    if cache is not None:
+        html = cache.get(url)
+        if html is not None:
+            return html
+    with httpx.Client(http2=True, headers=API_HEADERS, timeout=10.0, follow_redirects=True) as client:
+        response = client.get(url)
+        response.raise_for_status()
+        html = response.text
+    if cache is not None:
+        cache.set(url, html)
+    return html
+
+
+def open_article(page: Page, url: str, cache: ResponseCache | None = None) -> None:
+    """
+    Открывает статью в браузере, отдавая HTML документа из кэша, если он есть.
+    
+    Args:
+        page: Страница браузера
+        url: URL статьи
+        cache: Дисковый кэш ответов; None - всегда загружать из сети
+    """
+    html = cache.get(url) if cache is not None else None
+    if html is not None:
+        # Подменяем ответ на сам документ, поэтому URL страницы остается прежним
+        page.route(
+            lambda request_url: unquote(request_url) == unquote(url),
+            lambda route: route.fulfill(body=html, content_type="text/html; charset=utf-8"),
+        )
+        page.goto(url, wait_until="domcontentloaded")
+        return
+    
+    response = page.goto(url, wait_until="domcontentloaded")
+    if cache is not None and response is not None and response.ok:
+        cache.set(url, response.text())
+
+
+def find_oxygen_value_in_html(html: str, caption: str = "") -> tuple[str | None, list[str]]:
+    """
+    Ищет значение кислорода в таблицах HTML-документа.
+    
+    Args:
+        html: HTML статьи
+        caption: Подстрока caption таблицы; пустая строка - искать во всех таблицах
+    
+    Returns:
+        tuple[str | None, list[str]]: Текст ячейки со значением кислорода (или None)
+        и тексты ячеек строки "Кислород" для диагностики (пустой список, если строки нет)
+    """
+    doc = lxml_html.fromstring(html)
+    # text_content() в отличие от innerText включает скрытый текст, поэтому удаляем его заранее
+    for node in doc.xpath(_INVISIBLE_XPATH):
+        node.drop_tree()
+    # caption передается как переменная XPath, чтобы кавычки в нем не ломали выражение
+    rows = doc.xpath(
+        '//table[not($caption) or .//caption[contains(., $caption)]]//tr[*' + _OXYGEN_CELL_XPATH + ']',
+        caption=caption,
+    )
+    first_row_cells: list[str] = []
+    for row in rows:
+        cells = [cell.text_content().strip() for cell in row.xpath('./th | ./td')]
+        value = pick_percent_cell(cells)
+        if value is not None:
+            return value, cells
+        if not first_row_cells:
+            first_row_cells = cells
+    return None, first_row_cells
+
+
+def extract_oxygen_percent_text(page: Page, caption: str = "") -> tuple[str | None, list[str]]:
+    """
+    Ищет значение кислорода в таблицах открытой страницы.
+    
+    HTML страницы забирается из браузера один раз и разбирается локально через lxml.
+    
+    Args:
+        page: Страница с загруженной статьей
+        caption: Подстрока caption таблицы; пустая строка - искать во всех таблицах
+    
+    Returns:
+        tuple[str | None, list[str]]: Текст ячейки со значением кислорода (или None)
+        и тексты ячеек строки "Кислород" для диагностики (пустой список, если строки нет)
+    """
+    return find_oxygen_value_in_html(page.content(), caption)
+
+
+# Типы ресурсов, не нужные тестам: проверяется только текст DOM
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+# Счетчики и аналитика, которые только замедляют загрузку страниц
+BLOCKED_URL_RE = re.compile(r"analytics|wikimedia-tracking|googletagmanager")
+
+
+def block_unneeded_resources(route: Route) -> None:
+    """Отклоняет запросы к картинкам, стилям, шрифтам, медиа и аналитике."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_URL_RE.search(request.url):
+        route.abort()
+    else:
+        route.continue_()
+
+
+@pytest.fixture(scope="session")
+def shared_context(browser):
+    """
+    Создает один контекст браузера на всю сессию с блокировкой лишних ресурсов.
+    
+    Тесты только читают статьи, поэтому общий контекст безопасен: cookies
+    переиспользуются между тестами. Тесту, которому нужно чистое состояние,
+    достаточно вызвать page.context.clear_cookies(). HTTP-кэш браузера при этом
+    не работает: Playwright отключает его, когда включен context.route().
+    
+    При запуске через pytest-xdist каждый воркер - отдельный процесс со своим
+    экземпляром Playwright, поэтому браузер и контекст у каждого воркера свои.
+    """
     context = browser.new_context(
-        viewport={"width": 1920, "height": 1080}
+        viewport={"width": 1920, "height": 1080},
+        java_script_enabled=True,
     )
-    page = context.new_page()
+    context.route("**/*", block_unneeded_resources)
+    yield context
+    context.close()
+
+
+@pytest.fixture(scope="session")
+def response_cache():
+    """Возвращает дисковый кэш ответов, если он включен через WIKI_TEST_USE_CACHE=1."""
+    if os.environ.get("WIKI_TEST_USE_CACHE") != "1":
+        return None
+    return ResponseCache()
+
+
+@pytest.fixture(scope="function")
+def page(shared_context):
+    """Создает новую страницу в общем контексте браузера."""
+    page = shared_context.new_page()
     yield page
     page.close()
-    context.close()
 
 
+@pytest.mark.browser
 class TestWikipediaAtmosphere:
     """Тесты для проверки состава атмосферы планет на Wikipedia."""
     
     BASE_URL = "https://ru.wikipedia.org"
+    EARTH_ATMO_URL = f"{BASE_URL}/wiki/Атмосфера_Земли"
+    MARS_ATMO_URL = f"{BASE_URL}/wiki/Атмосфера_Марса"
+    # to_have_url ищет совпадение в любом месте URL, поэтому якоря и .* не нужны
+    _WIKI_URL_RE = re.compile(r"wikipedia\.org")
     
-    def test_earth_atmosphere_oxygen_positive(self, page: Page):
+    def test_earth_atmosphere_oxygen_positive(self, page: Page, response_cache):
         """
         Позитивный тест: проверка содержания кислорода в атмосфере Земли.
         Ожидается значение ≈ 20,95% с допуском ±0,2.
         """
-        # Шаг 1: Переход на главную страницу Wikipedia
-        page.goto(self.BASE_URL)
-        expect(page).to_have_url(re.compile(r".*wikipedia\.org.*"))
-        
-        # Шаг 2: Поиск статьи "Земля"
-        search_input = page.locator('input[name="search"]')
-        expect(search_input).to_be_visible(timeout=10000)
-        search_input.fill("Земля")
-        search_input.press("Enter")
-        
-        # Ожидание загрузки страницы (может быть страница результатов или статья)
-        page.wait_for_load_state("networkidle", timeout=10000)
-        
-        # Если открылась страница результатов поиска, кликаем на первый результат
-        page_title_text = page.locator('h1').inner_text()
-        if "fulltext" in page.url or "Поиск" in page.title() or "Результаты поиска" in page_title_text:
-            # Ищем ссылку на статью в результатах поиска - используем селектор для результатов поиска
-            first_result = page.locator('.mw-search-result-heading a').first
-            # Если не нашли, пробуем альтернативные селекторы
-            try:
-                expect(first_result).to_be_visible(timeout=2000)
-            except:
-                first_result = page.locator('.mw-search-results a[href*="/wiki/"]').first
-                expect(first_result).to_be_visible(timeout=5000)
-            first_result.click()
-            page.wait_for_load_state("networkidle", timeout=10000)
-        
-        # Ожидание видимости заголовка статьи
-        page_title = page.locator('h1')
-        expect(page_title).to_be_visible(timeout=5000)
-        expect(page_title).to_contain_text("Земля", timeout=5000)
-        
-        # Шаг 3: Поиск и клик по ссылке с href содержащим "Атмосфера_Земли"
-        # Пробуем найти по href (может быть URL-кодированным) или по тексту
-        atmosphere_link = page.locator('a[href*="Атмосфера_Земли"], a[href*="%D0%90%D1%82%D0%BC%D0%BE%D1%81%D1%84%D0%B5%D1%80%D0%B0_%D0%97%D0%B5%D0%BC%D0%BB%D0%B8"], a:has-text("Атмосфера Земли")').first
-        expect(atmosphere_link).to_be_visible(timeout=5000)
-        atmosphere_link.click()
-        
-        # Ожидание навигации на страницу "Атмосфера Земли"
-        # URL может быть в кодированном виде, поэтому проверяем заголовок
-        page.wait_for_load_state("networkidle", timeout=10000)
         page_title = page.locator('h1')
-        expect(page_title).to_be_visible(timeout=5000)
+        
+        # Шаг 1: Прямой переход на статью "Атмосфера Земли"
+        open_article(page, self.EARTH_ATMO_URL, response_cache)
+        expect(page).to_have_url(self._WIKI_URL_RE)
+        
+        # Ожидание заголовка статьи (to_contain_text сам дожидается элемента)
         expect(page_title).to_contain_text("Атмосфера Земли", timeout=5000)
         
-        # Шаг 4: Поиск таблицы "Состав сухого воздуха" по caption
-        table = page.locator('table:has(caption:has-text("Состав сухого воздуха"))')
-        expect(table).to_be_visible(timeout=5000)
-        
-        # Шаг 5: Поиск строки с "Кислород" (может быть в th или td)
-        oxygen_row = table.locator('tr:has(th:has-text("Кислород")), tr:has(td:has-text("Кислород"))')
-        expect(oxygen_row).to_be_visible(timeout=5000)
-        
-        # Шаг 6: Извлечение значения процента из строки "Кислород"
-        # Ищем ячейку с числовым значением (не сам заголовок "Кислород")
-        oxygen_cells = oxygen_row.locator('td')
-        oxygen_value_text = None
-        
-        for i in range(oxygen_cells.count()):
-            cell_text = oxygen_cells.nth(i).inner_text().strip()
-            # Пропускаем ячейку, если она содержит только "Кислород" без цифр
-            if 'кислород' in cell_text.lower() and not re.search(r'\d', cell_text):
-                continue
-            # Ищем ячейку с процентом или числом
-            if '%' in cell_text or re.search(r'\d+[,.]\d+', cell_text):
-                oxygen_value_text = cell_text
-                break
-        
-        # Если не нашли в td, пробуем все ячейки строки
-        if oxygen_value_text is None:
-            all_cells = oxygen_row.locator('th, td')
-            for i in range(all_cells.count()):
-                cell_text = all_cells.nth(i).inner_text().strip()
-                if 'кислород' in cell_text.lower() and not re.search(r'\d', cell_text):
-                    continue
-                if '%' in cell_text or re.search(r'\d+[,.]\d+', cell_text):
-                    oxygen_value_text = cell_text
-                    break
-        
-        assert oxygen_value_text, f"Не найдено процентное значение кислорода в таблице. Строка содержит: {oxygen_row.inner_text()}"
-        
-        # Шаг 7: Парсинг и проверка значения
+        # Шаг 2: Поиск значения кислорода в таблице "Состав сухого воздуха" по caption
+        oxygen_value_text, oxygen_row_cells = extract_oxygen_percent_text(page, "Состав сухого воздуха")
+        assert oxygen_value_text, \
+            f"Не найдено процентное значение кислорода в таблице \"Состав сухого воздуха\". " \
+            f"Строка 'Кислород' содержит: {oxygen_row_cells}"
+        
+        # Шаг 3: Парсинг и проверка значения
         oxygen_percent = parse_percent(oxygen_value_text)
         expected_value = 20.95
         tolerance = 0.2
@@ -140,100 +304,27 @@ class TestWikipediaAtmosphere:
             f"Значение кислорода {oxygen_percent}% не попадает в диапазон {min_value}% - {max_value}%. " \
             f"Ожидалось: {expected_value}% ± {tolerance}%. Фактическое значение из таблицы: '{oxygen_value_text}'"
     
-    def test_mars_atmosphere_oxygen_negative(self, page: Page):
+    def test_mars_atmosphere_oxygen_negative(self, page: Page, response_cache):
         """
         Негативный тест: проверка, что содержание кислорода в атмосфере Марса
         НЕ попадает в диапазон 20,5–21,5%.
         """
-        # Шаг 1: Переход на главную страницу Wikipedia
-        page.goto(self.BASE_URL)
-        expect(page).to_have_url(re.compile(r".*wikipedia\.org.*"))
-        
-        # Шаг 2: Поиск статьи "Марс"
-        search_input = page.locator('input[name="search"]')
-        expect(search_input).to_be_visible(timeout=10000)
-        search_input.fill("Марс")
-        search_input.press("Enter")
-        
-        # Ожидание загрузки страницы (может быть страница результатов или статья)
-        page.wait_for_load_state("networkidle", timeout=10000)
-        
-        # Если открылась страница результатов поиска, кликаем на первый результат
-        page_title_text = page.locator('h1').inner_text()
-        if "fulltext" in page.url or "Поиск" in page.title() or "Результаты поиска" in page_title_text:
-            # Ищем ссылку на статью в результатах поиска - используем селектор для результатов поиска
-            first_result = page.locator('.mw-search-result-heading a').first
-            # Если не нашли, пробуем альтернативные селекторы
-            try:
-                expect(first_result).to_be_visible(timeout=2000)
-            except:
-                first_result = page.locator('.mw-search-results a[href*="/wiki/"]').first
-                expect(first_result).to_be_visible(timeout=5000)
-            first_result.click()
-            page.wait_for_load_state("networkidle", timeout=10000)
-        
-        # Ожидание видимости заголовка статьи
-        page_title = page.locator('h1')
-        expect(page_title).to_be_visible(timeout=5000)
-        expect(page_title).to_contain_text("Марс", timeout=5000)
-        
-        # Шаг 3: Поиск и клик по ссылке с href содержащим "Атмосфера_Марса"
-        # Пробуем найти по href (может быть URL-кодированным) или по тексту
-        atmosphere_link = page.locator('a[href*="Атмосфера_Марса"], a[href*="%D0%90%D1%82%D0%BC%D0%BE%D1%81%D1%84%D0%B5%D1%80%D0%B0_%D0%9C%D0%B0%D1%80%D1%81%D0%B0"], a:has-text("Атмосфера Марса")').first
-        expect(atmosphere_link).to_be_visible(timeout=5000)
-        atmosphere_link.click()
-        
-        # Ожидание навигации на страницу "Атмосфера Марса"
-        # URL может быть в кодированном виде, поэтому проверяем заголовок
-        page.wait_for_load_state("networkidle", timeout=10000)
         page_title = page.locator('h1')
-        expect(page_title).to_be_visible(timeout=5000)
+        
+        # Шаг 1: Прямой переход на статью "Атмосфера Марса"
+        open_article(page, self.MARS_ATMO_URL, response_cache)
+        expect(page).to_have_url(self._WIKI_URL_RE)
+        
+        # Ожидание заголовка статьи (to_contain_text сам дожидается элемента)
         expect(page_title).to_contain_text("Атмосфера Марса", timeout=5000)
         
-        # Шаг 4: Поиск таблицы с составом атмосферы, содержащей "Кислород"
-        tables = page.locator('table')
-        oxygen_row = None
-        
-        # Ищем строку с "Кислород" во всех таблицах
-        for i in range(tables.count()):
-            current_table = tables.nth(i)
-            rows_with_oxygen = current_table.locator('tr:has(th:has-text("Кислород")), tr:has(td:has-text("Кислород"))')
-            if rows_with_oxygen.count() > 0:
-                oxygen_row = rows_with_oxygen.first
-                break
-        
-        assert oxygen_row is not None, "Не найдена строка с 'Кислород' в таблице состава атмосферы Марса"
-        expect(oxygen_row).to_be_visible(timeout=5000)
-        
-        # Шаг 5: Извлечение значения процента из строки "Кислород"
-        # Ищем ячейку с числовым значением (не сам заголовок "Кислород")
-        oxygen_cells = oxygen_row.locator('td')
-        oxygen_value_text = None
-        
-        for i in range(oxygen_cells.count()):
-            cell_text = oxygen_cells.nth(i).inner_text().strip()
-            # Пропускаем ячейку, если она содержит только "Кислород" без цифр
-            if 'кислород' in cell_text.lower() and not re.search(r'\d', cell_text):
-                continue
-            # Ищем ячейку с процентом или числом
-            if '%' in cell_text or re.search(r'\d+[,.]\d+', cell_text):
-                oxygen_value_text = cell_text
-                break
-        
-        # Если не нашли в td, пробуем все ячейки строки
-        if oxygen_value_text is None:
-            all_cells = oxygen_row.locator('th, td')
-            for i in range(all_cells.count()):
-                cell_text = all_cells.nth(i).inner_text().strip()
-                if 'кислород' in cell_text.lower() and not re.search(r'\d', cell_text):
-                    continue
-                if '%' in cell_text or re.search(r'\d+[,.]\d+', cell_text):
-                    oxygen_value_text = cell_text
-                    break
-        
-        assert oxygen_value_text, f"Не найдено процентное значение кислорода в таблице. Строка содержит: {oxygen_row.inner_text()}"
-        
-        # Шаг 6: Парсинг и проверка, что значение НЕ в диапазоне 20,5–21,5%
+        # Шаг 2: Поиск значения кислорода во всех таблицах статьи
+        oxygen_value_text, oxygen_row_cells = extract_oxygen_percent_text(page)
+        assert oxygen_value_text, \
+            f"Не найдено значение кислорода в таблицах состава атмосферы Марса. " \
+            f"Строка 'Кислород' содержит: {oxygen_row_cells}"
+        
+        # Шаг 3: Парсинг и проверка, что значение НЕ в диапазоне 20,5–21,5%
         oxygen_percent = parse_percent(oxygen_value_text)
         min_value = 20.5
         max_value = 21.5
@@ -243,3 +334,84 @@ class TestWikipediaAtmosphere:
             f"Фактическое значение из таблицы: '{oxygen_value_text}'. " \
             f"Ожидалось, что значение НЕ будет в диапазоне {min_value}% - {max_value}%"
 
+
+@pytest.mark.api
+class TestWikipediaAtmosphereApi:
+    """Быстрые тесты состава атмосферы через MediaWiki REST API без браузера."""
+    
+    EARTH_ATMO_SLUG = "Атмосфера_Земли"
+    MARS_ATMO_SLUG = "Атмосфера_Марса"
+    
+    def test_earth_atmosphere_oxygen_positive(self, response_cache):
+        """
+        Позитивный тест: содержание кислорода в атмосфере Земли ≈ 20,95% ± 0,2.
+        """
+        html = fetch_atmosphere_html(self.EARTH_ATMO_SLUG, response_cache)
+        oxygen_value_text, oxygen_row_cells = find_oxygen_value_in_html(html, "Состав сухого воздуха")
+        assert oxygen_value_text, \
+            f"Не найдено процентное значение кислорода в таблице \"Состав сухого воздуха\". " \
+            f"Строка 'Кислород' содержит: {oxygen_row_cells}"
+        
+        oxygen_percent = parse_percent(oxygen_value_text)
+        expected_value = 20.95
+        tolerance = 0.2
+        
+        assert abs(oxygen_percent - expected_value) <= tolerance, \
+            f"Значение кислорода {oxygen_percent}% не попадает в диапазон {expected_value}% ± {tolerance}%. " \
+            f"Фактическое значение из таблицы: '{oxygen_value_text}'"
+    
+    def test_mars_atmosphere_oxygen_negative(self, response_cache):
+        """
+        Негативный тест: содержание кислорода в атмосфере Марса НЕ попадает в диапазон 20,5–21,5%.
+        """
+        html = fetch_atmosphere_html(self.MARS_ATMO_SLUG, response_cache)
+        oxygen_value_text, oxygen_row_cells = find_oxygen_value_in_html(html)
+        assert oxygen_value_text, \
+            f"Не найдено значение кислорода в таблицах состава атмосферы Марса. " \
+            f"Строка 'Кислород' содержит: {oxygen_row_cells}"
+        
+        oxygen_percent = parse_percent(oxygen_value_text)
+        min_value = 20.5
+        max_value = 21.5
+        
+        assert not (min_value <= oxygen_percent <= max_value), \
+            f"Значение кислорода {oxygen_percent}% попадает в запрещенный диапазон {min_value}% - {max_value}%. " \
+            f"Фактическое значение из таблицы: '{oxygen_value_text}'"
+
+
+class TestResponseCache:
+    """Офлайн-тесты дискового кэша ответов (сеть и браузер не нужны)."""
+    
+    URL = "https://ru.wikipedia.org/wiki/Атмосфера_Земли"
+    
+    def test_set_get_roundtrip(self, tmp_path):
+        """Сохраненный HTML возвращается из кэша, отсутствующий URL - None."""
+        cache = ResponseCache(tmp_path)
+        assert cache.get(self.URL) is None
+        
+        cache.set(self.URL, "<h1>Атмосфера Земли</h1>")
+        
+        assert cache.get(self.URL) == "<h1>Атмосфера Земли</h1>"
+        assert not list(tmp_path.glob("*.tmp")), "Временный файл не должен оставаться после записи"
+    
+    def test_expired_entry_is_ignored(self, tmp_path):
+        """Запись старше TTL считается отсутствующей."""
+        cache = ResponseCache(tmp_path, ttl=60)
+        cache.set(self.URL, "<h1>old</h1>")
+        
+        expired = time.time() - 120
+        os.utime(cache._path(self.URL), (expired, expired))
+        
+        assert cache.get(self.URL) is None
+    
+    def test_fetch_uses_cache_without_network(self, tmp_path, monkeypatch):
+        """fetch_atmosphere_html берет HTML из кэша и не создает HTTP-клиент."""
+        cache = ResponseCache(tmp_path)
+        cache.set(WIKI_REST_HTML_URL.format(slug="Атмосфера_Земли"), "<p>cached</p>")
+        
+        def no_network(*args, **kwargs):
+            raise AssertionError("При попадании в кэш сеть использоваться не должна")
+        
+        monkeypatch.setattr(httpx, "Client", no_network)
+        
+        assert fetch_atmosphere_html("Атмосфера_Земли", cache) == "<p>cached</p>"